@@ -26,12 +26,15 @@ import argparse
 import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
 import geopandas as gpd
 import numpy as np
+import orjson
 import pandas as pd
+import shapely
 
 # ── locate project root regardless of where the script is invoked from ──────
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -41,13 +44,15 @@ DATA_OUTPUT  = PROJECT_ROOT / "data" / "output"
 
 BOROUGHS_FILE = DATA_RAW / "London_Boroughs.gpkg"
 
+MAX_CONCURRENT_BOROUGHS = 4    # Boroughs fetched at once; months fan out inside
+
 sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 from utils_police import (
     get_available_months,
-    fetch_borough_month,
+    fetch_borough_months,
     parse_crimes_to_records,
 )
-from utils_osm    import fetch_all_boroughs_parking
+from utils_osm    import fetch_all_boroughs_parking, load_cached_points
 from utils_alerts import enrich_panel, alert_summary, SPIKE_THRESHOLD
 
 
@@ -70,9 +75,9 @@ logger = logging.getLogger(__name__)
 def load_boroughs(gpkg_path: Path = BOROUGHS_FILE) -> gpd.GeoDataFrame:
     """
     Load London Boroughs from the .gpkg file, reproject to WGS84.
-    Returns GeoDataFrame sorted by gss_code with simplified geometry
-    written to a 'geom_simple' column (for API use) and original geometry
-    retained in 'geometry' (for output).
+    Returns GeoDataFrame sorted by gss_code with lightly simplified geometry
+    in 'geometry' (for output) and a coarser copy in 'geom_police' (for the
+    Police API poly parameter).
     """
     logger.info("Loading Borough boundaries from %s", gpkg_path)
     gdf = gpd.read_file(gpkg_path).to_crs(epsg=4326)
@@ -82,6 +87,15 @@ def load_boroughs(gpkg_path: Path = BOROUGHS_FILE) -> gpd.GeoDataFrame:
     # tolerance in degrees; ~0.0005° ≈ 50 m
     gdf["geometry"] = gdf["geometry"].simplify(0.0005, preserve_topology=True)
 
+    # Coarser copy for the Police API: ~0.002° ≈ 200 m is ample for counting
+    # crimes and keeps the poly= string short.  Snapping to 4 d.p. (~10 m)
+    # drops coordinate noise so the cache key stays stable across reruns.
+    gdf["geom_police"] = (
+        gdf["geometry"]
+        .simplify(0.002, preserve_topology=True)
+        .set_precision(0.0001)
+    )
+
     logger.info("  %d Boroughs loaded", len(gdf))
     return gdf
 
@@ -90,16 +104,14 @@ def load_boroughs(gpkg_path: Path = BOROUGHS_FILE) -> gpd.GeoDataFrame:
 # Step 2 – Resolve which months to fetch
 # ---------------------------------------------------------------------------
 
-def resolve_months(n_months: int) -> list[str]:
+def resolve_months(n_months: int,
+                   cache_dir: Path = DATA_CACHE) -> list[str]:
     """
     Ask the UK Police API for available months and return the last n_months.
+    The API answer is cached for a day under cache_dir/police/months.json.
     Falls back to a hard-coded list if the API is unreachable.
     """
-    import requests
-    session = requests.Session()
-    session.headers.update({"User-Agent": "BikeCrimeExplorer/1.0"})
-
-    available = get_available_months(session)
+    available = get_available_months(cache_path=cache_dir / "police" / "months.json")
 
     if not available:
         logger.warning("Could not reach UK Police API – generating fallback month list")
@@ -130,43 +142,58 @@ def fetch_all_crimes(gdf: gpd.GeoDataFrame,
                      dry_run: bool = False) -> pd.DataFrame:
     """
     For every Borough × month combination, fetch bicycle theft incidents and
-    aggregate to a theft_count per (area_id, month) row.
+    aggregate to a theft_count per (area_id, month) row.  Raw results are
+    cached by utils_police in cache_dir/police/cache.db, keyed by Borough,
+    a hash of its query geometry, cell and month.  Requests go through
+    utils_police's pooled session (and its retry policy).
+
+    Borough × month combos for which a Police request failed are only
+    partially counted; they are listed in a warning at the end (and are
+    retried on the next run, as their merged result is not cached).
 
     Returns a DataFrame with columns: area_id, area_name, month, theft_count.
     """
-    import requests
-    session = requests.Session()
-    session.headers.update({"User-Agent": "BikeCrimeExplorer/1.0"})
-
     police_cache = cache_dir / "police"
-    all_records: list[dict] = []
-
-    total_combos = len(gdf) * len(months)
-    done = 0
-
-    for _, row in gdf.iterrows():
-        gss       = row["gss_code"]
-        name      = row["name"]
-        geom      = row["geometry"]
-
-        for month in months:
-            done += 1
-            pct = done / total_combos * 100
-            logger.info("[%3.0f%%] %s – %s", pct, name, month)
-
-            if dry_run:
-                all_records.append({"area_id": gss, "area_name": name,
-                                    "month": month, "theft_count": 0})
-                continue
-
-            crimes = fetch_borough_month(name, geom, month, police_cache, session)
-            records = parse_crimes_to_records(crimes, gss, name, month)
-            all_records.extend(records)
-
-    if not all_records:
+    frames: list[pd.DataFrame] = []
+    incomplete: list[tuple[str, str]] = []
+
+    boroughs = list(zip(gdf["gss_code"], gdf["name"], gdf["geom_police"], gdf["geometry"]))
+
+    def _fetch_borough(gss, name, geom, boundary):
+        fetched, missing = fetch_borough_months(name, geom, months, police_cache,
+                                                boundary=boundary)
+        frames = [parse_crimes_to_records(crimes, gss, name, month)
+                  for month, crimes in fetched.items()]
+        return frames, [(name, month) for month in missing]
+
+    if dry_run:
+        frames.append(pd.DataFrame(
+            [(gss, name, month) for gss, name, *_ in boroughs for month in months],
+            columns=["area_id", "area_name", "month"],
+        ))
+    else:
+        # Each Borough's months are already requested concurrently (bounded
+        # per host inside utils_police), so only a few Boroughs need to be in
+        # flight at once to keep the API connection slots busy.
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BOROUGHS) as pool:
+            futures = {pool.submit(_fetch_borough, *b): b[1] for b in boroughs}
+            for done, future in enumerate(as_completed(futures), start=1):
+                logger.info("[%3.0f%%] %s – %d months",
+                            done / len(boroughs) * 100, futures[future], len(months))
+                borough_frames, borough_missing = future.result()
+                frames.extend(borough_frames)
+                incomplete.extend(borough_missing)
+
+        if incomplete:
+            logger.warning("%d Borough × month combos are incomplete (counts too low; "
+                           "rerun to retry): %s", len(incomplete),
+                           ", ".join(f"{n} {m}" for n, m in sorted(incomplete)))
+
+    frames = [f for f in frames if not f.empty]
+    if not frames:
         return pd.DataFrame(columns=["area_id", "area_name", "month", "theft_count"])
 
-    df = pd.DataFrame(all_records)
+    df = pd.concat(frames, ignore_index=True)
 
     # Aggregate to (area_id, month) counts
     agg = (
@@ -186,30 +213,14 @@ def fetch_exposure(gdf: gpd.GeoDataFrame,
                    skip_osm: bool = False) -> dict[str, int]:
     """
     Return {gss_code: parking_count} for each Borough.
-    If skip_osm=True, returns zeros (useful when cache already populated).
+    If skip_osm=True, counts come from cached Overpass responses only
+    (0 for Boroughs with no cache file).
     """
     osm_cache = cache_dir / "osm"
 
     if skip_osm:
         logger.info("--no-osm flag set: using cached OSM data only")
-        # Try to read from cache; fall back to 0
-        result: dict[str, int] = {}
-        for _, row in gdf.iterrows():
-            safe = row["name"].replace(" ", "_")
-            cp   = osm_cache / f"{safe}_parking.json"
-            if cp.exists():
-                with open(cp) as f:
-                    raw = json.load(f)
-                from shapely.geometry import Point
-                count = sum(
-                    1 for e in raw.get("elements", [])
-                    if _elem_to_point(e) is not None
-                    and row["geometry"].contains(_elem_to_point(e))
-                )
-                result[row["gss_code"]] = count
-            else:
-                result[row["gss_code"]] = 0
-        return result
+        return _count_cached_parking(gdf, osm_cache)
 
     logger.info("Fetching OSM bicycle_parking counts for all %d Boroughs", len(gdf))
     name_to_count = fetch_all_boroughs_parking(gdf, osm_cache, name_col="name")
@@ -219,20 +230,19 @@ def fetch_exposure(gdf: gpd.GeoDataFrame,
     return {name_to_gss[n]: c for n, c in name_to_count.items()}
 
 
-def _elem_to_point(elem):
-    """Minimal helper used in the skip_osm path above."""
-    from shapely.geometry import Point
-    t = elem.get("type")
-    if t == "node":
-        lat, lon = elem.get("lat"), elem.get("lon")
-    elif t == "way":
-        c = elem.get("center", {})
-        lat, lon = c.get("lat"), c.get("lon")
-    else:
-        return None
-    if lat is None or lon is None:
-        return None
-    return Point(lon, lat)
+def _count_cached_parking(gdf: gpd.GeoDataFrame, osm_cache: Path) -> dict[str, int]:
+    """
+    Count cached Overpass features per Borough with one vectorised
+    shapely.contains_xy test against its own polygon.  Boroughs without a
+    cache file get 0.  A Borough's bbox response covers its whole polygon,
+    so no spatial join across Boroughs (or dedup of overlapping neighbour
+    responses) is needed.
+    """
+    result: dict[str, int] = {}
+    for name, gss, geom in zip(gdf["name"], gdf["gss_code"], gdf.geometry.values):
+        points = load_cached_points(name, osm_cache)
+        result[gss] = 0 if points is None else int(shapely.contains_xy(geom, *points).sum())
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -247,15 +257,14 @@ def build_panel(crime_df: pd.DataFrame,
     Create a complete (area_id × month) Cartesian product and fill in
     theft_count and exposure for every cell.
     """
-    area_rows = [
-        {"area_id": row["gss_code"], "area_name": row["name"]}
-        for _, row in gdf.iterrows()
-    ]
-    index_df = pd.DataFrame(
-        [(a["area_id"], a["area_name"], m)
-         for a in area_rows
-         for m in months],
-        columns=["area_id", "area_name", "month"],
+    index_df = (
+        pd.MultiIndex.from_product([gdf["gss_code"], months],
+                                   names=["area_id", "month"])
+        .to_frame(index=False)
+        .merge(gdf[["gss_code", "name"]]
+               .rename(columns={"gss_code": "area_id", "name": "area_name"}),
+               on="area_id")
+        [["area_id", "area_name", "month"]]
     )
 
     # Left-join crime counts (missing → 0)
@@ -282,7 +291,7 @@ def export_areas_geojson(gdf: gpd.GeoDataFrame, out_dir: Path) -> Path:
     export_gdf = gdf[["gss_code", "name", "geometry"]].rename(
         columns={"gss_code": "area_id", "name": "area_name"}
     )
-    export_gdf.to_file(out_path, driver="GeoJSON")
+    export_gdf.to_file(out_path, driver="GeoJSON", engine="pyogrio")
     size_kb = out_path.stat().st_size / 1024
     logger.info("Wrote areas.geojson  (%.1f KB)", size_kb)
     return out_path
@@ -297,22 +306,23 @@ def export_features_json(panel: pd.DataFrame, out_dir: Path) -> Path:
     """
     out_path = out_dir / "features.json"
 
-    # Round floats
-    for col in ["risk_ratio", "city_mean_ratio", "risk_index"]:
-        if col in panel.columns:
-            panel[col] = panel[col].round(4)
+    # Round floats as one 2-D block rather than column by column
+    float_cols = [c for c in ("risk_ratio", "city_mean_ratio", "risk_index")
+                  if c in panel.columns]
+    if float_cols:
+        panel[float_cols] = np.round(panel[float_cols].to_numpy(np.float64), 4)
 
-    # Convert bool columns so JSON serialisation is clean
-    for col in ["valid_exposure", "stability_flag", "alert_spike", "alert_trend3"]:
-        if col in panel.columns:
-            panel[col] = panel[col].astype(bool)
+    # Convert bool and categorical columns so JSON serialisation is clean
+    bool_cols = [c for c in ("valid_exposure", "stability_flag", "alert_spike", "alert_trend3")
+                 if c in panel.columns]
+    cat_cols = panel.select_dtypes("category").columns
+    panel = panel.astype({**dict.fromkeys(bool_cols, bool),
+                          **dict.fromkeys(cat_cols, str)})
 
-    records = json.loads(
-        panel.to_json(orient="records", force_ascii=False)
-    )
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False, allow_nan=False,
-                  default=lambda x: None)   # NaN → null
+    # NaN → None (null); orjson serialises the records straight to UTF-8
+    # bytes without an intermediate JSON string.
+    records = panel.replace({np.nan: None}).to_dict(orient="records")
+    out_path.write_bytes(orjson.dumps(records, option=orjson.OPT_SERIALIZE_NUMPY))
 
     size_kb = out_path.stat().st_size / 1024
     logger.info("Wrote features.json  (%.1f KB, %d rows)", size_kb, len(panel))
@@ -326,9 +336,10 @@ def export_meta_json(gdf: gpd.GeoDataFrame,
     """Write meta.json with month list, area index, field descriptions."""
     out_path = out_dir / "meta.json"
 
+    by_name = gdf.sort_values("name")
     areas = [
-        {"id": row["gss_code"], "name": row["name"]}
-        for _, row in gdf.sort_values("name").iterrows()
+        {"id": gss, "name": name}
+        for gss, name in zip(by_name["gss_code"], by_name["name"])
     ]
 
     meta = {
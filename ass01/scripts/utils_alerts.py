@@ -37,51 +37,60 @@ STABILITY_MIN_EXPOSURE = 10   # Boroughs with fewer parking spots than this
 SPIKE_THRESHOLD        = 0.50  # 50 % above 6-month baseline triggers alert_spike
 BASELINE_WINDOW        = 6     # months of history used to compute the baseline
 
+ALERT_LEVELS = np.array(["none", "watch", "warning"])   # indexed by flag count
+CATEGORY_COLUMNS = ("area_id", "area_name", "month")     # string keys → category
+
 
 # ---------------------------------------------------------------------------
 # Step 1 – risk_ratio and risk_index
 # ---------------------------------------------------------------------------
 
-def add_risk_metrics(df: pd.DataFrame) -> pd.DataFrame:
+def add_risk_metrics(df: pd.DataFrame, _inplace: bool = False) -> pd.DataFrame:
     """
     Add valid_exposure, risk_ratio, city_mean_ratio, risk_index,
     and stability_flag columns.
 
     Operates on a copy; returns the enriched DataFrame.
     The DataFrame must already be sorted by (area_id, month) or
-    the function will sort it internally.
+    the function will sort it internally.  enrich_panel passes
+    _inplace=True for a frame it owns, so it is sorted and enriched
+    without another copy.
     """
-    df = df.copy()
-
     # Ensure consistent sort so window calculations below are correct
-    df = df.sort_values(["area_id", "month"]).reset_index(drop=True)
+    # (sort_values without inplace already returns a fresh frame)
+    if _inplace:
+        df.sort_values(["area_id", "month"], inplace=True, ignore_index=True)
+    else:
+        df = df.sort_values(["area_id", "month"], ignore_index=True)
 
     # ---- basic validity ----
     df["valid_exposure"] = df["exposure"] > 0
     df["stability_flag"] = df["exposure"] < STABILITY_MIN_EXPOSURE
 
     # ---- risk_ratio ----
-    df["risk_ratio"] = np.where(
-        df["valid_exposure"],
-        df["theft_count"] / df["exposure"],
-        np.nan,
-    )
+    # np.divide(where=...) only divides the valid lanes; the rest keep NaN
+    valid = df["valid_exposure"].to_numpy()
+    rr = np.full(len(df), np.nan)
+    np.divide(df["theft_count"].to_numpy(np.float64),
+              df["exposure"].to_numpy(np.float64),
+              out=rr, where=valid)
+    df["risk_ratio"] = rr
 
     # ---- city_mean_ratio: per-month mean over valid Boroughs ----
-    city_mean = (
-        df[df["valid_exposure"]]
-        .groupby("month")["risk_ratio"]
-        .mean()
-        .rename("city_mean_ratio")
+    # invalid rows are NaN in risk_ratio, so mean() skips them; transform
+    # broadcasts the monthly mean back onto every row without a merge
+    df["city_mean_ratio"] = (
+        df["risk_ratio"]
+        .groupby(df["month"], observed=True)
+        .transform("mean")
     )
-    df = df.merge(city_mean, on="month", how="left")
 
     # ---- risk_index ----
-    df["risk_index"] = np.where(
-        df["valid_exposure"] & (df["city_mean_ratio"] > 0),
-        df["risk_ratio"] / df["city_mean_ratio"],
-        np.nan,
-    )
+    city = df["city_mean_ratio"].to_numpy(np.float64)
+    ri = np.full(len(df), np.nan)
+    np.divide(df["risk_ratio"].to_numpy(np.float64), city,
+              out=ri, where=df["valid_exposure"].to_numpy() & (city > 0))
+    df["risk_index"] = ri
 
     return df
 
@@ -91,67 +100,68 @@ def add_risk_metrics(df: pd.DataFrame) -> pd.DataFrame:
 # ---------------------------------------------------------------------------
 
 def _spike_flag(series: pd.Series,
+                groups: pd.Series,
                 window: int   = BASELINE_WINDOW,
                 threshold: float = SPIKE_THRESHOLD) -> pd.Series:
     """
-    For a single Borough's time-sorted risk_index series, return a boolean
+    For a risk_index series sorted by (area_id, month), return a boolean
     Series where True means the value is > baseline * (1 + threshold).
 
-    baseline for month t = mean of t-window … t-1 (rolling, min_periods=3).
+    baseline for month t = mean of t-window … t-1 within the same area
+    (rolling, min_periods=3).  All areas are handled in one grouped pass.
     """
-    baseline = series.shift(1).rolling(window=window, min_periods=3).mean()
+    baseline = (
+        series.groupby(groups, sort=False, observed=True).shift(1)
+        .groupby(groups, sort=False, observed=True)
+        .rolling(window=window, min_periods=3)
+        .mean()
+        .reset_index(level=0, drop=True)
+    )
     return series > baseline * (1 + threshold)
 
 
-def _trend3_flag(series: pd.Series) -> pd.Series:
+def _trend3_flag(series: pd.Series, groups: pd.Series) -> pd.Series:
     """
-    Return True for month t when risk_index[t-2] < risk_index[t-1] < risk_index[t].
-    Requires at least 3 valid observations; otherwise False.
+    Return True for month t when risk_index[t-2] < risk_index[t-1] < risk_index[t]
+    within the same area.  Requires at least 3 valid observations; otherwise False.
     """
-    s1 = series.shift(1)   # t-1
-    s2 = series.shift(2)   # t-2
+    g  = series.groupby(groups, sort=False, observed=True)
+    s1 = g.shift(1)   # t-1
+    s2 = g.shift(2)   # t-2
     return (series > s1) & (s1 > s2)
 
 
 def add_alert_flags(df: pd.DataFrame,
                     spike_threshold: float = SPIKE_THRESHOLD,
-                    baseline_window: int   = BASELINE_WINDOW) -> pd.DataFrame:
+                    baseline_window: int   = BASELINE_WINDOW,
+                    _sorted: bool = False) -> pd.DataFrame:
     """
     Add alert_spike, alert_trend3, and alert_level columns.
 
     The input DataFrame must have:  area_id, month, risk_index.
     It should already be sorted by (area_id, month).
 
-    Returns enriched DataFrame (operates on a copy).
+    Returns the enriched DataFrame.  By default the input is sorted into a
+    new frame and left untouched.  With _sorted=True (as enrich_panel passes
+    for the fresh, already-sorted frame from add_risk_metrics) the sort is
+    skipped and the flag columns are written into the caller's frame.
     """
-    df = df.copy().sort_values(["area_id", "month"]).reset_index(drop=True)
-
-    spike_flags  = []
-    trend3_flags = []
-
-    for area_id, group in df.groupby("area_id", sort=False):
-        ri = group["risk_index"]
-
-        spike  = _spike_flag(ri, window=baseline_window, threshold=spike_threshold)
-        trend3 = _trend3_flag(ri)
-
-        # Fill NaN positions (insufficient history or no valid exposure) → False
-        spike_flags.append(spike.fillna(False))
-        trend3_flags.append(trend3.fillna(False))
+    if not _sorted:
+        df = df.sort_values(["area_id", "month"]).reset_index(drop=True)
 
-    df["alert_spike"]  = pd.concat(spike_flags).reindex(df.index)
-    df["alert_trend3"] = pd.concat(trend3_flags).reindex(df.index)
+    ri    = df["risk_index"]
+    areas = df["area_id"]
 
-    # alert_level: combine both flags
-    def _level(row) -> str:
-        n = int(row["alert_spike"]) + int(row["alert_trend3"])
-        if n == 0:
-            return "none"
-        if n == 1:
-            return "watch"
-        return "warning"
+    # NaN positions (insufficient history or no valid exposure) compare False
+    df["alert_spike"]  = _spike_flag(ri, areas,
+                                     window=baseline_window,
+                                     threshold=spike_threshold).fillna(False)
+    df["alert_trend3"] = _trend3_flag(ri, areas).fillna(False)
 
-    df["alert_level"] = df.apply(_level, axis=1)
+    # alert_level: number of flags raised (0/1/2) indexes the label array
+    n_flags = (df["alert_spike"].to_numpy(dtype=np.int8)
+               + df["alert_trend3"].to_numpy(dtype=np.int8))
+    df["alert_level"] = ALERT_LEVELS[n_flags]
 
     return df
 
@@ -181,11 +191,17 @@ def enrich_panel(df: pd.DataFrame,
     Returns
     -------
     pd.DataFrame  – sorted by (area_id, month), all derived columns added.
+                    area_id, area_name and month are returned as categoricals.
     """
-    df = add_risk_metrics(df)
+    # Categorical keys make the sort / groupby below hash small ints instead
+    # of strings.  astype returns a new frame, so both steps can then work
+    # on it in place.
+    df = df.astype(dict.fromkeys(CATEGORY_COLUMNS, "category"))
+    df = add_risk_metrics(df, _inplace=True)
     df = add_alert_flags(df,
                          spike_threshold=spike_threshold,
-                         baseline_window=baseline_window)
+                         baseline_window=baseline_window,
+                         _sorted=True)
     return df
 
 
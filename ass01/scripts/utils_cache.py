@@ -0,0 +1,90 @@
+"""
+utils_cache.py
+--------------
+Single-file SQLite store for cached API responses.
+
+Every entry is one row of a `(key PRIMARY KEY, blob)` table, so a cache with
+thousands of Borough × cell × month responses costs one file descriptor
+instead of thousands of tiny files, and can be wiped by deleting one file.
+The database runs in WAL mode; a single connection per file is shared by
+all threads behind a lock.
+
+Values are stored as orjson bytes, zstd-compressed when the optional
+`zstandard` package is installed.  Reads recognise compressed blobs by the
+zstd frame header, so a cache written with either setting stays readable.
+"""
+
+from __future__ import annotations
+
+import functools
+import sqlite3
+import threading
+from pathlib import Path
+
+import orjson
+
+try:                                  # optional: ~5× smaller blobs when present
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_MAGIC  = b"\x28\xb5\x2f\xfd"     # first bytes of every zstd frame
+CACHE_LEVEL = 3                       # zstd compression level for stored blobs
+
+
+class BlobCache:
+    """Thread-safe key → JSON cache backed by one SQLite database."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path  = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, blob BLOB NOT NULL)"
+        )
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def load(self, key: str):
+        """Return the cached object for `key`, or None if absent."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        blob = row[0]
+        if blob[:4] == ZSTD_MAGIC:
+            if zstandard is None:     # written elsewhere with zstd; treat as a miss
+                return None
+            blob = zstandard.ZstdDecompressor().decompress(blob)
+        return orjson.loads(blob)
+
+    def store(self, key: str, obj) -> None:
+        """Insert or replace the cached object for `key`."""
+        blob = orjson.dumps(obj)
+        if zstandard is not None:
+            blob = zstandard.ZstdCompressor(level=CACHE_LEVEL).compress(blob)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, blob) VALUES (?, ?)", (key, blob)
+            )
+
+
+@functools.lru_cache(maxsize=None)
+def _open(path: Path) -> BlobCache:
+    return BlobCache(path)
+
+
+def open_cache(path: Path) -> BlobCache:
+    """Return the shared BlobCache for a database file (opened once per path)."""
+    return _open(Path(path).resolve())
@@ -9,9 +9,20 @@ For each London Borough we:
   1. Query Overpass for all nodes/ways tagged amenity=bicycle_parking whose
      centroid falls within the Borough bounding box.
   2. Filter results to points that lie within the actual Borough polygon
-     (using Shapely point-in-polygon).
+     (one vectorised shapely.contains_xy call per Borough).
   3. Count the surviving features → exposure (parking_count).
   4. Cache the raw Overpass response per Borough so repeated runs are free.
+     Responses are parsed incrementally with ijson while they are copied
+     into the cache, so no Borough is ever held in memory as one JSON
+     document.  Caches are compressed (zstd when the optional `zstandard` package is
+     installed, gzip otherwise); legacy uncompressed .json caches still load.
+  5. Save the extracted (lon, lat) pairs next to it as a .npy array.  Later
+     runs memory-map that instead of re-parsing the JSON, which is kept only
+     as a debugging artifact and to rebuild the .npy if it goes missing.
+  6. Treat a cache as fresh for CACHE_TTL.  After that it is revalidated
+     with If-None-Match when Overpass sent an ETag (a 304 keeps the cache),
+     and re-downloaded otherwise; a failed refresh falls back to the old
+     cache.
 
 Overpass endpoint used: https://overpass-api.de/api/interpreter
 A public mirror (overpass.kumi.systems) is tried as fallback.
@@ -19,13 +30,30 @@ A public mirror (overpass.kumi.systems) is tried as fallback.
 
 from __future__ import annotations
 
-import json
+import contextlib
+import functools
+import gzip
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
 from pathlib import Path
+from urllib.parse import urlparse
 
+import ijson
+import numpy as np
 import requests
-from shapely.geometry import Point
+import shapely
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError
+from urllib3.util.retry import Retry
+
+from utils_ratelimit import TokenBucket
+
+try:                                  # optional: faster than gzip when present
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +62,15 @@ OVERPASS_ENDPOINTS = [
     "https://overpass.kumi.systems/api/interpreter",
 ]
 REQUEST_TIMEOUT = 90   # seconds; Overpass queries can be slow
-REQUEST_DELAY   = 2.0  # seconds between requests
+REQUEST_DELAY   = 2.0  # seconds between request starts per endpoint host
+MAX_WORKERS     = 4    # concurrent Borough queries (Overpass allows only a few)
+BUSY_RETRIES    = 2    # extra attempts per endpoint when it reports it is busy
+BUSY_STATUSES   = {429, 503, 504}
+CACHE_LEVEL     = 3    # zstd / gzip compression level for cached responses
+CACHE_TTL       = timedelta(days=30)   # bicycle parking changes slowly
+
+# Spaces request starts per mirror host; the first MAX_WORKERS go out at once.
+_RATE_LIMIT = TokenBucket(rate=1 / REQUEST_DELAY, capacity=MAX_WORKERS)
 
 
 # ---------------------------------------------------------------------------
@@ -61,58 +97,277 @@ out center;"""
 # HTTP helpers
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
 def _get_session() -> requests.Session:
+    """
+    Return the module's shared keep-alive session (built once).
+    Overpass queries are read-only, so POSTs are safe to retry on a bad
+    gateway; 429/503/504 "busy" answers are left to _query_overpass.
+    """
     session = requests.Session()
     session.headers.update({"User-Agent": "BikeCrimeExplorer/1.0 (academic project)"})
+    retry = Retry(total=3, backoff_factor=1.5, status_forcelist=[502],
+                  allowed_methods=["GET", "POST"], raise_on_status=False)
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                                          max_retries=retry))
     return session
 
 
-def _query_overpass(query: str, session: requests.Session) -> dict | None:
-    """Try each Overpass endpoint in turn; return parsed JSON or None."""
+def _query_overpass(query: str, session: requests.Session,
+                    headers: dict | None = None) -> requests.Response | None:
+    """
+    Try each Overpass endpoint in turn; return the streaming 200 response
+    (body not yet read), a 304 response to a conditional request, or None.
+    A busy endpoint (429/503/504) is retried with exponential backoff
+    before falling through to the next mirror.
+    """
     for endpoint in OVERPASS_ENDPOINTS:
-        try:
-            resp = session.post(endpoint, data={"data": query}, timeout=REQUEST_TIMEOUT)
+        for attempt in range(BUSY_RETRIES + 1):
+            _RATE_LIMIT.wait(urlparse(endpoint).hostname)
+            try:
+                resp = session.post(endpoint, data={"data": query}, headers=headers,
+                                    timeout=REQUEST_TIMEOUT, stream=True)
+            except requests.RequestException as exc:
+                logger.debug("  Overpass %s error: %s", endpoint, exc)
+                break
             if resp.status_code == 200:
-                return resp.json()
+                resp.raw.decode_content = True    # undo any gzip transfer encoding
+                return resp
+            if resp.status_code == 304:
+                return resp
+            resp.close()
             logger.debug("  Overpass %s returned HTTP %d", endpoint, resp.status_code)
-        except requests.RequestException as exc:
-            logger.debug("  Overpass %s error: %s", endpoint, exc)
-        finally:
-            time.sleep(REQUEST_DELAY)
+            if resp.status_code not in BUSY_STATUSES:
+                break
+            if attempt < BUSY_RETRIES:
+                time.sleep(REQUEST_DELAY * (2 ** (attempt + 1)))
     logger.warning("  All Overpass endpoints failed for this query")
     return None
 
 
 # ---------------------------------------------------------------------------
-# Point extraction from Overpass elements
+# Response cache
 # ---------------------------------------------------------------------------
 
-def _element_to_point(elem: dict) -> Point | None:
+def _cache_stem(borough_name: str, cache_dir: Path) -> Path:
+    safe_name = borough_name.replace(" ", "_")
+    return cache_dir / f"{safe_name}_parking.json"
+
+
+def _cache_file(borough_name: str, cache_dir: Path) -> Path | None:
+    """Return the path of the cached Overpass response for a Borough, if any."""
+    stem = _cache_stem(borough_name, cache_dir)
+    zst  = stem.with_name(stem.name + ".zst")
+    gz   = stem.with_name(stem.name + ".gz")
+
+    if zstandard is not None and zst.exists():
+        return zst
+    if gz.exists():
+        return gz
+    if stem.exists():                 # uncompressed cache from older runs
+        return stem
+    return None
+
+
+def _open_cache(borough_name: str, cache_dir: Path):
     """
-    Convert an Overpass element to a Shapely Point.
-    - node: use lat/lon directly.
-    - way:  use the 'center' lat/lon returned by 'out center;'.
+    Open the cached Overpass response for a Borough as a decompressed binary
+    stream, or return None if absent.
     """
-    etype = elem.get("type")
-    if etype == "node":
-        lat = elem.get("lat")
-        lon = elem.get("lon")
-    elif etype == "way":
-        center = elem.get("center", {})
-        lat = center.get("lat")
-        lon = center.get("lon")
-    else:
+    path = _cache_file(borough_name, cache_dir)
+    if path is None:
         return None
+    if path.suffix == ".zst":
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _etag_path(borough_name: str, cache_dir: Path) -> Path:
+    return _cache_stem(borough_name, cache_dir).with_suffix(".etag")
+
+
+@contextlib.contextmanager
+def _cache_writer(borough_name: str, cache_dir: Path):
+    """
+    Yield a binary sink that compresses into the Borough's cache with zstd
+    (or gzip).  Data goes to a temporary file that only replaces the cache
+    once the block exits cleanly, so an interrupted download leaves no
+    truncated cache behind.
+    """
+    stem = _cache_stem(borough_name, cache_dir)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    path = stem.with_name(stem.name + (".zst" if zstandard is not None else ".gz"))
+    tmp  = path.with_name(path.name + ".tmp")
+
+    try:
+        with open(tmp, "wb") as fh:
+            if zstandard is not None:
+                cctx = zstandard.ZstdCompressor(level=CACHE_LEVEL)
+                with cctx.stream_writer(fh, closefd=False) as sink:
+                    yield sink
+            else:
+                with gzip.GzipFile(fileobj=fh, mode="wb",
+                                   compresslevel=CACHE_LEVEL) as sink:
+                    yield sink
+        tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class _TeeReader:
+    """File-like reader that copies every chunk it returns into `sink`."""
+
+    def __init__(self, src, sink):
+        self._src  = src
+        self._sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._src.read(size)
+        self._sink.write(chunk)
+        return chunk
+
+
+def _iter_elements(f):
+    """Lazily yield the Overpass elements from a binary JSON stream."""
+    return ijson.items(f, "elements.item", use_float=True)
+
+
+def _points_path(borough_name: str, cache_dir: Path) -> Path:
+    return _cache_stem(borough_name, cache_dir).with_suffix(".npy")
+
+
+def _save_points(borough_name: str, cache_dir: Path,
+                 lons: np.ndarray, lats: np.ndarray) -> None:
+    """Write a Borough's extracted coordinates as an (N, 2) float64 .npy."""
+    path = _points_path(borough_name, cache_dir)
+    tmp  = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:        # np.save(path) would append ".npy"
+        np.save(f, np.column_stack([lons, lats]))
+    tmp.replace(path)
 
-    if lat is None or lon is None:
+
+def load_cached_points(borough_name: str,
+                       cache_dir: Path) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Return cached (lon, lat) arrays for a Borough without fetching, or None
+    if nothing is cached.  The .npy point cache is memory-mapped; when only
+    the JSON response is cached, it is parsed once and the .npy written.
+    """
+    npy = _points_path(borough_name, cache_dir)
+    if npy.exists():
+        points = np.load(npy, mmap_mode="r")
+        return points[:, 0], points[:, 1]
+
+    f = _open_cache(borough_name, cache_dir)
+    if f is None:
         return None
-    return Point(lon, lat)   # Shapely uses (x=lng, y=lat)
+    with f:
+        lons, lats = _elements_to_lonlat(_iter_elements(f))
+    _save_points(borough_name, cache_dir, lons, lats)
+    return lons, lats
+
+
+# ---------------------------------------------------------------------------
+# Point extraction from Overpass elements
+# ---------------------------------------------------------------------------
+
+def _elements_to_lonlat(elements) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (lon, lat) float arrays for all Overpass nodes and way centres.
+    - node: use lat/lon directly.
+    - way:  use the 'center' lat/lon returned by 'out center;'.
+
+    `elements` may be any iterable, including the lazy stream from
+    _iter_elements.  Each element is branched on its type once and read by
+    subscription inside a single generator feeding np.fromiter, so no
+    per-element function calls or intermediate list of tuples is built.
+    Elements of any other type, or without a coordinate, are skipped.
+    """
+    lonlat = np.fromiter(
+        ((c["lon"], c["lat"])
+         for e in elements
+         if (c := e if e["type"] == "node" else e.get("center")) and "lat" in c),
+        dtype=np.dtype((np.float64, 2)),
+    )
+    return lonlat[:, 0], lonlat[:, 1]
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+def _load_parking_points(borough_name: str,
+                         borough_geom,
+                         cache_dir: Path,
+                         session: requests.Session) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Return (lon, lat) arrays of the bicycle parking in a Borough's bounding
+    box, reading from or writing to the per-Borough cache.  None if every
+    endpoint failed.
+
+    A fresh response is parsed as it downloads while a copy of the raw
+    bytes is compressed into the cache; the extracted points are then saved
+    as .npy for load_cached_points.  Caches older than CACHE_TTL are
+    revalidated (see the module docstring).
+    """
+    # ---- load from cache while fresh ----
+    cached = _cache_file(borough_name, cache_dir)
+    if cached is None and _points_path(borough_name, cache_dir).exists():
+        cached = _points_path(borough_name, cache_dir)
+    if cached is not None:
+        age = time.time() - cached.stat().st_mtime
+        if age < CACHE_TTL.total_seconds():
+            logger.info("  [OSM] %s – loaded from cache", borough_name)
+            return load_cached_points(borough_name, cache_dir)
+
+    # ---- (re)validate against Overpass ----
+    etag_path = _etag_path(borough_name, cache_dir)
+    headers = {}
+    if cached is not None and etag_path.exists():
+        headers["If-None-Match"] = etag_path.read_text().strip()
+
+    logger.info("  [OSM] %s – querying Overpass", borough_name)
+    minx, miny, maxx, maxy = borough_geom.bounds   # (west, south, east, north)
+    query = _build_query(south=miny, west=minx, north=maxy, east=maxx)
+    resp = _query_overpass(query, session, headers=headers)
+
+    if resp is None:
+        return _stale_or_none(borough_name, cache_dir, cached, "Overpass failed")
+
+    if resp.status_code == 304:
+        resp.close()
+        cached.touch()                # restart the TTL
+        logger.info("  [OSM] %s – not modified, using cache", borough_name)
+        return load_cached_points(borough_name, cache_dir)
+
+    try:
+        with resp, _cache_writer(borough_name, cache_dir) as sink:
+            lons, lats = _elements_to_lonlat(_iter_elements(_TeeReader(resp.raw, sink)))
+    except (OSError, HTTPError, ijson.JSONError) as exc:
+        return _stale_or_none(borough_name, cache_dir, cached,
+                              f"response stream failed ({exc})")
+
+    _save_points(borough_name, cache_dir, lons, lats)
+    etag = resp.headers.get("ETag")
+    if etag:
+        etag_path.write_text(etag)
+    else:
+        etag_path.unlink(missing_ok=True)
+    return lons, lats
+
+
+def _stale_or_none(borough_name: str, cache_dir: Path,
+                   cached: Path | None, reason: str):
+    """Fall back to an expired cache after a failed refresh, else None."""
+    if cached is not None:
+        logger.warning("  [OSM] %s – %s, using expired cache", borough_name, reason)
+        return load_cached_points(borough_name, cache_dir)
+    logger.warning("  [OSM] %s – %s, returning 0", borough_name, reason)
+    return None
+
+
 def fetch_borough_parking(borough_name: str,
                            borough_geom,          # Shapely Polygon (WGS84)
                            cache_dir: Path,
@@ -138,35 +393,14 @@ def fetch_borough_parking(borough_name: str,
     if session is None:
         session = _get_session()
 
-    safe_name = borough_name.replace(" ", "_")
-    cache_path = cache_dir / f"{safe_name}_parking.json"
-
-    # ---- load from cache ----
-    if cache_path.exists():
-        with open(cache_path, encoding="utf-8") as f:
-            raw = json.load(f)
-        logger.info("  [OSM] %s – loaded from cache", borough_name)
-    else:
-        logger.info("  [OSM] %s – querying Overpass", borough_name)
-        minx, miny, maxx, maxy = borough_geom.bounds   # (west, south, east, north)
-        query = _build_query(south=miny, west=minx, north=maxy, east=maxx)
-        raw = _query_overpass(query, session)
-
-        if raw is None:
-            logger.warning("  [OSM] %s – Overpass failed, returning 0", borough_name)
-            return 0
-
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(raw, f)
+    points = _load_parking_points(borough_name, borough_geom, cache_dir, session)
+    if points is None:
+        return 0
 
     # ---- spatial filter: keep only points inside the Borough polygon ----
-    elements = raw.get("elements", [])
-    count = 0
-    for elem in elements:
-        pt = _element_to_point(elem)
-        if pt is not None and borough_geom.contains(pt):
-            count += 1
+    # One vectorised GEOS call over coordinate arrays; no Point objects.
+    lons, lats = points
+    count = int(shapely.contains_xy(borough_geom, lons, lats).sum())
 
     logger.info("  [OSM] %s – %d parking features (after polygon filter)", borough_name, count)
     return count
@@ -174,11 +408,19 @@ def fetch_borough_parking(borough_name: str,
 
 def fetch_all_boroughs_parking(boroughs_gdf,       # GeoDataFrame, CRS=4326
                                 cache_dir: Path,
-                                name_col: str = "name") -> dict[str, int]:
+                                name_col: str = "name",
+                                session: requests.Session = None,
+                                max_workers: int = MAX_WORKERS) -> dict[str, int]:
     """
     Convenience wrapper: fetch parking counts for every Borough in a
     GeoDataFrame and return a {borough_name: count} dict.
 
+    Each Borough's bbox response is fetched (or read from cache) on a thread
+    pool, then counted against its own polygon with shapely.contains_xy.
+    No STRtree over all Boroughs is needed: a Borough's bbox covers its
+    polygon, so no feature of that Borough can sit in another's response,
+    and one vectorised test per Borough equals a tree query over them all.
+
     Parameters
     ----------
     boroughs_gdf : GeoDataFrame
@@ -186,18 +428,43 @@ def fetch_all_boroughs_parking(boroughs_gdf,       # GeoDataFrame, CRS=4326
     cache_dir : Path
     name_col : str
         Column containing Borough names.
+    session : requests.Session, optional
+        Shared session; the module's pooled session is used when omitted.
+    max_workers : int
+        Boroughs queried concurrently.  Raising it only helps on cold
+        caches; _RATE_LIMIT still spaces request starts per mirror.
 
     Returns
     -------
-    dict  {borough_name: parking_count}
+    dict  {borough_name: parking_count}  – 0 for Boroughs whose fetch failed.
     """
-    session = _get_session()
-    results: dict[str, int] = {}
-
-    for _, row in boroughs_gdf.iterrows():
-        name  = row[name_col]
-        geom  = row.geometry
-        count = fetch_borough_parking(name, geom, cache_dir, session)
-        results[name] = count
+    if session is None:
+        session = _get_session()
 
+    # Overpass only tolerates a few concurrent queries per client; request
+    # starts are additionally spaced by _RATE_LIMIT (see _query_overpass).
+    # Materialise names and geometries once, before dispatching work.
+    names = boroughs_gdf[name_col].to_numpy()
+    geoms = boroughs_gdf.geometry.values
+
+    loaded: dict[str, tuple | None] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_load_parking_points, name, geom, cache_dir, session): name
+            for name, geom in zip(names, geoms)
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            loaded[futures[fut]] = fut.result()
+            logger.debug("  [OSM] %d/%d Boroughs loaded", done, len(futures))
+
+    # A Borough's bbox response covers its whole polygon, so counting it
+    # against that polygon alone sees every feature once, even though
+    # neighbouring bboxes overlap.
+    results: dict[str, int] = {}
+    for name, geom in zip(names, geoms):
+        points = loaded[name]
+        results[name] = (0 if points is None
+                         else int(shapely.contains_xy(geom, *points).sum()))
+        logger.info("  [OSM] %s – %d parking features (after polygon filter)",
+                    name, results[name])
     return results
@@ -6,127 +6,279 @@ Fetch bicycle theft crime data from the UK Police Open Data API.
 Key behaviours:
   - Simplifies Borough polygon to ≤ MAX_POLY_POINTS vertices for the API.
   - If the API returns 503 (area too large), automatically subdivides the
-    bounding box into a 2×2 grid and retries each cell, then deduplicates.
-  - All responses are cached as JSON files so repeated runs skip API calls.
-  - Returns a flat list of incident dicts [{id, lat, lng, date}, ...].
+    bounding box into a 2×2 grid and retries the cells, then deduplicates.
+    Cells are plain bbox quadrants (no polygon clipping), so every result
+    is filtered back to the real Borough boundary.
+  - Months (and, in build_dataset, Boroughs) are fetched concurrently.
+  - All responses are cached in one SQLite database (see utils_cache) so
+    repeated runs skip API calls.
+  - Returns raw incident dicts; parse_crimes_to_records flattens them into
+    a DataFrame of {area_id, area_name, month, crime_id, lat, lng}.
 """
 
 from __future__ import annotations
 
-import json
-import time
+import functools
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import numpy as np
+import orjson
+import pandas as pd
 import requests
+import shapely
+from requests.adapters import HTTPAdapter
 from shapely.geometry import box, shape, mapping
 from shapely.ops import unary_union
+from urllib3.util.retry import Retry
+
+from utils_cache import BlobCache, open_cache
+from utils_ratelimit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
-POLICE_API_BASE = "https://data.police.uk/api"
+POLICE_API_HOST = "data.police.uk"
+POLICE_API_BASE = f"https://{POLICE_API_HOST}/api"
 MAX_POLY_POINTS = 25      # UK Police API accepts up to 100 points; keep well below
-REQUEST_DELAY   = 0.6     # seconds between requests to be polite to the API
+REQUESTS_PER_SECOND = 10  # API allows 15/s (burst 30); stay politely below
 MAX_GRID_DEPTH  = 2       # maximum recursion depth when subdividing large areas
+SIMPLIFY_TOL_START    = 0.01   # degrees; upper bracket for the tolerance search
+SIMPLIFY_BISECT_STEPS = 8      # bisection steps after bracketing
+MONTHS_CACHE_TTL = timedelta(days=1)   # available-months list changes ~monthly
+MAX_CONCURRENT_PER_HOST = 8   # in-flight requests to data.police.uk across threads
+
+# Shared by every thread that calls the API (Borough and month workers
+# alike), so concurrency stays bounded however the calls nest.
+_HOST_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_PER_HOST)
+_RATE_LIMIT = TokenBucket(rate=REQUESTS_PER_SECOND, capacity=REQUESTS_PER_SECOND)
+
+RECORD_COLUMNS = ["area_id", "area_name", "month", "crime_id", "lat", "lng"]
+
+SIZE_REGISTRY_FILE = "size_registry.json"   # smallest bbox seen to return 503
+CACHE_DB_FILE      = "cache.db"             # per-(Borough, cell, month) responses
+_registry_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Small JSON state files
+# ---------------------------------------------------------------------------
+
+def _read_json(path: Path):
+    """Return the parsed contents of a JSON file, or None if missing/unreadable."""
+    try:
+        return orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _write_json_atomic(path: Path, obj) -> None:
+    """Write obj as JSON via a temp file so an interrupted run never leaves a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps(obj))
+    tmp.replace(path)
 
 
 # ---------------------------------------------------------------------------
 # Polygon helpers
 # ---------------------------------------------------------------------------
 
-def _simplify_to_n_points(geom, max_points: int = MAX_POLY_POINTS):
-    """Return the exterior ring of a polygon simplified to ≤ max_points vertices."""
-    coords = list(geom.exterior.coords)
+@functools.lru_cache(maxsize=512)
+def _simplify_wkb(wkb: bytes, max_points: int) -> tuple:
+    """
+    Return the exterior ring of a polygon (given as WKB) simplified to
+    ≤ max_points vertices.  Memoised on the WKB: the same Borough (or grid
+    cell) is simplified again for every month otherwise.
+    """
+    geom = shapely.from_wkb(wkb)
+    coords = tuple(geom.exterior.coords)
     if len(coords) <= max_points:
         return coords[:-1]          # drop duplicate closing vertex
 
-    tolerance = 0.0001
-    simplified = geom
+    def _n_vertices(tolerance: float) -> int:
+        return len(geom.simplify(tolerance, preserve_topology=True).exterior.coords)
+
+    # Bracket the smallest tolerance that fits, then bisect towards it.
+    lo, hi = 0.0, SIMPLIFY_TOL_START
     for _ in range(30):
-        simplified = geom.simplify(tolerance, preserve_topology=True)
-        n = len(list(simplified.exterior.coords))
-        if n <= max_points:
+        if _n_vertices(hi) <= max_points:
             break
-        tolerance *= 2.0
+        lo, hi = hi, hi * 2.0
+    for _ in range(SIMPLIFY_BISECT_STEPS):
+        mid = (lo + hi) / 2
+        if _n_vertices(mid) <= max_points:
+            hi = mid
+        else:
+            lo = mid
+
+    return tuple(geom.simplify(hi, preserve_topology=True).exterior.coords)[:-1]
+
 
-    return list(simplified.exterior.coords)[:-1]
+def _bbox_area(geom) -> float:
+    """Bounding-box area in degrees², a cheap proxy for 'too large' queries."""
+    minx, miny, maxx, maxy = geom.bounds
+    return (maxx - minx) * (maxy - miny)
+
+
+def _read_registry(registry_path: Path) -> dict:
+    """Registry contents; a missing or unreadable file counts as empty."""
+    registry = _read_json(registry_path)
+    return registry if isinstance(registry, dict) else {}
+
+
+def _is_likely_too_large(geom, registry_path: Path | None) -> bool:
+    """
+    True when geom's bbox is at least as large as the smallest full-Borough
+    bbox confirmed to be too large, as recorded in registry_path.
+    """
+    if registry_path is None:
+        return False
+    with _registry_lock:
+        threshold = _read_registry(registry_path).get("min_too_large_bbox_deg2")
+    return isinstance(threshold, (int, float)) and _bbox_area(geom) >= threshold
+
+
+def _record_too_large(geom, registry_path: Path | None) -> None:
+    """Lower the registry threshold if geom's bbox is the smallest 503 so far."""
+    if registry_path is None:
+        return
+    area = _bbox_area(geom)
+    with _registry_lock:
+        registry = _read_registry(registry_path)
+        current = registry.get("min_too_large_bbox_deg2")
+        if not isinstance(current, (int, float)) or area < current:
+            registry["min_too_large_bbox_deg2"] = area
+            _write_json_atomic(registry_path, registry)
 
 
 def _coords_to_api_string(coords) -> str:
     """Convert [(lng, lat), ...] pairs to the API poly string 'lat,lng:lat,lng:...'"""
-    return ":".join(f"{lat:.6f},{lng:.6f}" for lng, lat in coords)
+    return ":".join(map("%.6f,%.6f".__mod__, ((lat, lng) for lng, lat in coords)))
+
+
+@functools.lru_cache(maxsize=512)
+def _poly_str_for(geom_wkb: bytes) -> str:
+    """API poly string for a geometry (given as WKB), built once per run."""
+    return _coords_to_api_string(_simplify_wkb(geom_wkb, MAX_POLY_POINTS))
 
 
 # ---------------------------------------------------------------------------
 # API helpers
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
 def _get_session() -> requests.Session:
+    """
+    Return the module's shared keep-alive session (built once).
+    503 is deliberately not retried: the API uses it to say "area too
+    large", which _fetch_with_subdivision answers by subdividing.
+    """
     session = requests.Session()
     session.headers.update({"User-Agent": "BikeCrimeExplorer/1.0 (academic project)"})
+    retry = Retry(total=3, backoff_factor=1.5,
+                  status_forcelist=[502, 504], raise_on_status=False)
+    session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32,
+                                          max_retries=retry))
     return session
 
 
-def get_available_months(session: requests.Session = None) -> list[str]:
+def get_available_months(session: requests.Session = None,
+                         cache_path: Path | None = None) -> list[str]:
     """
     Query the API for the list of available data months.
     Returns sorted list of 'YYYY-MM' strings, most recent last.
+
+    If cache_path is given, a result fetched less than MONTHS_CACHE_TTL ago
+    is read from that file instead of calling the API, and fresh results
+    are written back to it.  An expired list is still returned when the API
+    cannot be reached; an unreadable cache file counts as no cache.
     """
+    stale: list[str] = []
+    if cache_path is not None:
+        cached = _read_json(cache_path)
+        try:
+            fetched_at = datetime.fromisoformat(cached["fetched_at"])
+            stale = list(cached["months"])
+        except (TypeError, KeyError, ValueError):
+            stale = []
+        if stale and datetime.now(timezone.utc) - fetched_at < MONTHS_CACHE_TTL:
+            logger.info("Available months (cached): %s … %s (%d total)",
+                        stale[0], stale[-1], len(stale))
+            return stale
+
     if session is None:
         session = _get_session()
     try:
+        _RATE_LIMIT.wait(POLICE_API_HOST)
         resp = session.get(f"{POLICE_API_BASE}/crimes-street-dates", timeout=15)
         resp.raise_for_status()
-        dates = resp.json()
+        dates = orjson.loads(resp.content)
         months = sorted(d["date"] for d in dates)
         logger.info("Available months: %s … %s (%d total)",
                     months[0], months[-1], len(months))
-        return months
     except Exception as exc:
-        logger.warning("Could not fetch available months: %s", exc)
-        return []
+        if stale:
+            logger.warning("Could not fetch available months (%s); "
+                           "using expired cached list", exc)
+        else:
+            logger.warning("Could not fetch available months: %s", exc)
+        return stale
+
+    if cache_path is not None:
+        _write_json_atomic(cache_path, {
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "months": months,
+        })
+    return months
 
 
 # ---------------------------------------------------------------------------
 # Core fetch – single polygon / month
 # ---------------------------------------------------------------------------
 
+class _FetchError(Exception):
+    """A request failed for a reason other than 'area too large'."""
+
+
 def _fetch_single_poly(poly_str: str, month: str,
-                        cache_path: Path,
+                        cache: BlobCache,
+                        cache_key: str,
                         session: requests.Session) -> list | None:
     """
     Call the API for one polygon + month.
-    Returns list of crime dicts, [] on non-503 error, None on 503 (area too big).
-    Reads from / writes to cache_path.
+    Returns list of crime dicts, or None on 503 (area too big); raises
+    _FetchError on any other failure.  Reads from / writes to cache[cache_key].
     """
-    if cache_path.exists():
-        with open(cache_path, encoding="utf-8") as f:
-            return json.load(f)
+    cached = cache.load(cache_key)
+    if cached is not None:
+        return cached
 
     url = f"{POLICE_API_BASE}/crimes-street/bicycle-theft"
     params = {"poly": poly_str, "date": month}
 
+    _RATE_LIMIT.wait(POLICE_API_HOST)
     try:
-        resp = session.get(url, params=params, timeout=45)
+        with _HOST_SLOTS:
+            resp = session.get(url, params=params, timeout=45)
     except requests.RequestException as exc:
-        logger.warning("  Request error (%s %s): %s", month, cache_path.stem, exc)
-        return []
-    finally:
-        time.sleep(REQUEST_DELAY)
+        logger.warning("  Request error (%s %s): %s", month, cache_key, exc)
+        raise _FetchError from exc
 
     if resp.status_code == 503:
-        logger.debug("  503 (area too large) for %s", cache_path.stem)
+        logger.debug("  503 (area too large) for %s", cache_key)
         return None                  # signal to caller to subdivide
 
     if resp.status_code != 200:
-        logger.warning("  HTTP %d for %s %s", resp.status_code, month, cache_path.stem)
-        return []
-
-    crimes = resp.json()
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(crimes, f)
-    logger.debug("  Fetched %d crimes for %s %s", len(crimes), month, cache_path.stem)
+        logger.warning("  HTTP %d for %s %s", resp.status_code, month, cache_key)
+        raise _FetchError
+
+    crimes = orjson.loads(resp.content)
+    cache.store(cache_key, crimes)
+    logger.debug("  Fetched %d crimes for %s %s", len(crimes), month, cache_key)
     return crimes
 
 
@@ -134,31 +286,73 @@ def _fetch_single_poly(poly_str: str, month: str,
 # Recursive grid-subdivision fetch
 # ---------------------------------------------------------------------------
 
+def _within_boundary(crimes: list, boundary) -> list:
+    """
+    Keep the crimes located inside (or on) `boundary`.  Crimes without a
+    usable coordinate are kept, as there is nothing to test them against.
+    """
+    if not crimes:
+        return crimes
+    locs = [c.get("location") or {} for c in crimes]
+    lats = pd.to_numeric(pd.Series([d.get("latitude") for d in locs]), errors="coerce")
+    lngs = pd.to_numeric(pd.Series([d.get("longitude") for d in locs]), errors="coerce")
+    keep = shapely.intersects_xy(boundary, lngs.to_numpy(), lats.to_numpy())
+    keep |= lats.isna().to_numpy() | lngs.isna().to_numpy()
+    return [c for c, k in zip(crimes, keep) if k]
+
+
 def _fetch_with_subdivision(geom,
                              month: str,
-                             cache_dir: Path,
+                             cache: BlobCache,
+                             borough_key: str,
                              session: requests.Session,
                              depth: int = 0,
-                             cell_id: str = "") -> list:
+                             cell_id: str = "",
+                             registry_path: Path | None = None,
+                             boundary=None) -> tuple[list, bool]:
     """
     Fetch crimes for a geometry, subdividing into a 2×2 grid on 503.
-    Returns deduplicated list of incident dicts.
+    Returns (deduplicated list of incident dicts, complete), where complete
+    is False if any request failed or a cell hit MAX_GRID_DEPTH.
+
+    Quadrants are sent to the API as their bounding boxes; `boundary`
+    (defaulting to the depth-0 geometry, passed down the recursion) only
+    decides which quadrants to skip.  The result is not clipped here:
+    callers filter it with _within_boundary, whichever path produced it.
+
+    At depth 0, a geometry whose bbox is known to be too large (see
+    _is_likely_too_large) skips the doomed whole-area request and goes
+    straight to the quadrants.  A depth-0 503 is only recorded in the
+    registry once every quadrant came back, so a transient 503 (or an
+    outage) does not lower the threshold.
+
+    Responses are cached under "{borough_key}/{cell}/{month}", with cell
+    "full" for the whole geometry and e.g. "NE_SW" for quadrants; see
+    _borough_cache_key.  The "full" entry is the only cache of a complete
+    Borough × month result, so a merge with a failed cell is not stored.
     """
-    coords = _simplify_to_n_points(geom)
-    poly_str = _coords_to_api_string(coords)
-
     label = cell_id if cell_id else "full"
-    cache_path = cache_dir / f"{label}_{month}.json"
+    cache_key = f"{borough_key}/{label}/{month}"
+
+    skip_whole = (depth == 0
+                  and cache_key not in cache
+                  and _is_likely_too_large(geom, registry_path))
 
-    result = _fetch_single_poly(poly_str, month, cache_path, session)
+    if not skip_whole:
+        poly_str = _poly_str_for(geom.wkb)
+
+        try:
+            result = _fetch_single_poly(poly_str, month, cache, cache_key, session)
+        except _FetchError:
+            return [], False
 
-    if result is not None:          # success or non-503 error
-        return result
+        if result is not None:
+            return result, True
 
     if depth >= MAX_GRID_DEPTH:
         logger.warning("  Max subdivision depth reached for %s %s – skipping cell",
                        month, label)
-        return []
+        return [], False
 
     # Subdivide into 2×2 grid cells
     minx, miny, maxx, maxy = geom.bounds
@@ -172,42 +366,72 @@ def _fetch_with_subdivision(geom,
     ]
     suffixes = ["NW", "NE", "SW", "SE"]
 
-    all_crimes: list = []
-    seen_ids: set = set()
-
+    # A box is a valid ≤ 5-point API polygon as it is; the extra area it
+    # covers outside the Borough is filtered out after merging.
+    if boundary is None:
+        boundary = geom
+    cells = []
     for quad, suffix in zip(quadrants, suffixes):
-        clipped = geom.intersection(quad)
-        if clipped.is_empty:
+        if not boundary.intersects(quad):
             continue
         sub_id = f"{label}_{suffix}" if cell_id else suffix
-        crimes = _fetch_with_subdivision(
-            clipped, month, cache_dir, session,
-            depth=depth + 1, cell_id=sub_id
-        )
+        cells.append((quad, sub_id))
+
+    # Quadrants are fetched inline by the calling month worker.  Concurrency
+    # already comes from the Borough and month pools above this call, so a
+    # pool per 503 would only add threads parked on _HOST_SLOTS.
+    results = [
+        _fetch_with_subdivision(quad, month, cache, borough_key, session,
+                                depth=depth + 1, cell_id=sub_id, boundary=boundary)
+        for quad, sub_id in cells
+    ]
+
+    # Every street-level crime carries a top-level "id", and all cells share
+    # the same month, so the id alone identifies duplicates across cells.
+    all_crimes: list = []
+    seen_ids: set = set()
+    seen_add = seen_ids.add
+
+    complete = all(ok for _, ok in results)
+    for crimes, _ in results:
         for c in crimes:
-            uid = c.get("id") or (c.get("location", {}) or {}).get("street", {}).get("id", "")
-            key = (uid, c.get("month", ""))
-            if key not in seen_ids:
-                seen_ids.add(key)
-                all_crimes.append(c)
+            uid = c["id"]
+            if uid in seen_ids:
+                continue
+            seen_add(uid)
+            all_crimes.append(c)
 
-    # Cache merged result so the top-level call is cached next run
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(all_crimes, f)
+    if depth == 0 and complete and not skip_whole:   # quadrants confirm the 503
+        _record_too_large(geom, registry_path)
 
-    return all_crimes
+    # Cache the merged result so the top-level call is a hit next run.  An
+    # incomplete merge is not stored: the failed cells must be retried, and
+    # the cells that did succeed are already cached under their own keys.
+    if complete:
+        cache.store(cache_key, all_crimes)
+
+    return all_crimes, complete
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+def _borough_cache_key(borough_name: str, borough_geom) -> str:
+    """
+    Cache-key prefix for a Borough.  It includes a hash of the query
+    geometry so a boundary edit only invalidates that Borough's entries.
+    """
+    geom_hash = hashlib.sha1(borough_geom.wkb).hexdigest()[:16]
+    return f"{borough_name.replace(' ', '_')}@{geom_hash}"
+
+
 def fetch_borough_month(borough_name: str,
                          borough_geom,          # Shapely geometry (WGS84)
                          month: str,            # 'YYYY-MM'
                          cache_dir: Path,
-                         session: requests.Session = None) -> list[dict]:
+                         session: requests.Session = None,
+                         boundary=None) -> list[dict]:
     """
     Fetch all bicycle theft incidents for one Borough and one month.
 
@@ -216,12 +440,16 @@ def fetch_borough_month(borough_name: str,
     borough_name : str
         Used only for log messages.
     borough_geom : Shapely Polygon
-        Borough boundary in WGS84 (EPSG:4326).
+        Borough boundary in WGS84 (EPSG:4326) used for the API queries
+        (typically a simplified copy).
     month : str
         Target month, e.g. '2025-01'.
     cache_dir : Path
-        Directory under which per-borough cache files are stored.
+        Directory holding the response database and size registry.
     session : requests.Session, optional
+    boundary : Shapely Polygon, optional
+        Exact Borough boundary the returned crimes are filtered to;
+        borough_geom when omitted.
 
     Returns
     -------
@@ -230,42 +458,108 @@ def fetch_borough_month(borough_name: str,
     if session is None:
         session = _get_session()
 
-    borough_cache_dir = cache_dir / borough_name.replace(" ", "_")
     logger.info("  [Police] %s – %s", borough_name, month)
 
-    crimes = _fetch_with_subdivision(
-        borough_geom, month, borough_cache_dir, session
+    if boundary is None:
+        boundary = borough_geom
+    crimes, complete = _fetch_with_subdivision(
+        borough_geom, month, open_cache(cache_dir / CACHE_DB_FILE),
+        _borough_cache_key(borough_name, borough_geom), session,
+        registry_path=cache_dir / SIZE_REGISTRY_FILE, boundary=boundary,
     )
-    return crimes
+    if not complete:
+        logger.warning("  [Police] %s – %s is incomplete (a cell failed); "
+                       "its count will be too low", borough_name, month)
+    return _within_boundary(crimes, boundary)
+
+
+def fetch_borough_months(borough_name: str,
+                          borough_geom,          # Shapely geometry (WGS84)
+                          months: list[str],     # ['YYYY-MM', ...]
+                          cache_dir: Path,
+                          session: requests.Session = None,
+                          max_workers: int = MAX_CONCURRENT_PER_HOST,
+                          boundary=None) -> tuple[dict[str, list[dict]], list[str]]:
+    """
+    Fetch bicycle theft incidents for one Borough over several months.
+
+    The months are requested concurrently and share one simplified poly
+    string; _HOST_SLOTS and _RATE_LIMIT still bound the traffic against the
+    API.  Per-(cell, month) cache entries are written exactly as by
+    fetch_borough_month, and a month that answers 503 is subdivided on its
+    own without holding up the others.  `max_workers` caps the month
+    threads; more than MAX_CONCURRENT_PER_HOST only queues on _HOST_SLOTS.
+    `boundary` is as for fetch_borough_month.
+
+    Returns
+    -------
+    (fetched, incomplete)
+        fetched : dict  {month: list of raw crime dicts}, in the order of
+        `months`.  incomplete : list of the months for which some request
+        failed, so their crimes are only partial; they are not cached as
+        a whole and are retried on the next run.
+    """
+    if session is None:
+        session = _get_session()
+    if boundary is None:
+        boundary = borough_geom
+
+    cache = open_cache(cache_dir / CACHE_DB_FILE)
+    borough_key = _borough_cache_key(borough_name, borough_geom)
+    registry_path = cache_dir / SIZE_REGISTRY_FILE
+    logger.info("  [Police] %s – %d months", borough_name, len(months))
+
+    # Warm the poly-string cache so the month threads don't each simplify.
+    _poly_str_for(borough_geom.wkb)
+
+    workers = max(min(len(months), max_workers), 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_fetch_with_subdivision, borough_geom, month,
+                        cache, borough_key, session,
+                        registry_path=registry_path, boundary=boundary): month
+            for month in months
+        }
+        fetched = {}
+        incomplete = set()
+        for fut in as_completed(futures):
+            month = futures[fut]
+            crimes, complete = fut.result()
+            fetched[month] = _within_boundary(crimes, boundary)
+            if not complete:
+                incomplete.add(month)
+                logger.warning("  [Police] %s – %s is incomplete (a cell failed)",
+                               borough_name, month)
+            logger.debug("  [Police] %s – %s: %d crimes",
+                         borough_name, month, len(fetched[month]))
+    return ({month: fetched[month] for month in months},
+            [month for month in months if month in incomplete])
 
 
 def parse_crimes_to_records(crimes: list[dict],
                               borough_gss: str,
                               borough_name: str,
-                              month: str) -> list[dict]:
+                              month: str) -> pd.DataFrame:
     """
     Extract only the fields we need from raw API crime objects.
 
-    Returns list of minimal dicts:
-      {area_id, area_name, month, crime_id, lat, lng}
+    Returns a DataFrame with one row per crime and columns
+      area_id, area_name, month, crime_id, lat, lng
+    (lat / lng are NaN where the API gave no usable coordinate).
     """
-    records = []
-    for c in crimes:
-        loc = c.get("location") or {}
-        lat_str = loc.get("latitude")
-        lng_str = loc.get("longitude")
-        try:
-            lat = float(lat_str) if lat_str else None
-            lng = float(lng_str) if lng_str else None
-        except (TypeError, ValueError):
-            lat = lng = None
-
-        records.append({
-            "area_id":   borough_gss,
-            "area_name": borough_name,
-            "month":     month,
-            "crime_id":  c.get("id", ""),
-            "lat":       lat,
-            "lng":       lng,
-        })
-    return records
+    if not crimes:
+        return pd.DataFrame(columns=RECORD_COLUMNS)
+
+    raw = pd.json_normalize(crimes, sep=".")
+
+    def _column(name: str) -> pd.Series:
+        return raw[name] if name in raw else pd.Series(np.nan, index=raw.index)
+
+    return pd.DataFrame({
+        "area_id":   borough_gss,
+        "area_name": borough_name,
+        "month":     month,
+        "crime_id":  _column("id"),
+        "lat":       pd.to_numeric(_column("location.latitude"), errors="coerce"),
+        "lng":       pd.to_numeric(_column("location.longitude"), errors="coerce"),
+    }, columns=RECORD_COLUMNS)
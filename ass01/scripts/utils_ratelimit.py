@@ -0,0 +1,37 @@
+"""
+utils_ratelimit.py
+------------------
+Thread-safe token-bucket rate limiter shared by the API clients.
+
+Each host gets its own bucket holding up to `capacity` tokens that refill at
+`rate` tokens per second.  A caller takes one token immediately before it
+sends a request; if the bucket is empty it sleeps just long enough for the
+next token.  Cache hits never touch the bucket, so they cost no delay.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Per-host token bucket: at most `rate` requests/s, bursts of `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate     = rate
+        self.capacity = capacity
+        self._lock    = threading.Lock()
+        self._state: dict[str, tuple[float, float]] = {}   # host → (tokens, t)
+
+    def wait(self, host: str) -> None:
+        """Block until a request to `host` is allowed, then consume a token."""
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._state.get(host, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate) - 1
+            # A negative balance reserves the next token for this caller, so
+            # concurrent waiters queue up instead of all waking at once.
+            self._state[host] = (tokens, now)
+        if tokens < 0:
+            time.sleep(-tokens / self.rate)